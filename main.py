@@ -7,27 +7,139 @@ Properly detects and requires AmneziaWG (not standard WireGuard)
 import os
 import sys
 import re
+import csv
 import json
+import heapq
+import hashlib
+import mmap
 import time
 import shutil
+import select
+import signal
+import socket
+import struct
+import asyncio
 import argparse
+import operator
 import platform
+import functools
+import itertools
+import tempfile
 import subprocess
-import statistics
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Any
-from itertools import product
+from dataclasses import dataclass, field, fields, replace
+from typing import List, Dict, Optional, Tuple, Any, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import orjson  # optional, faster results serialization
+except ImportError:
+    orjson = None
+
+
+# The platform never changes under us; branch on these instead of asking
+_SYSTEM = platform.system()
+_IS_WINDOWS = _SYSTEM == "Windows"
+
+
+# Round-trip times in ping output ("time=12.3 ms", "time<1ms"). Every ping
+# we drive prints it in lowercase, and a case-sensitive literal lets re
+# jump between matches with a fast substring search
+_PING_RE = re.compile(rb'time[=<](\d+(?:\.\d+)?)')
+
+# fping -C summary on stderr: "target : 12.3 11.9 -", "-" for a lost probe
+_FPING_RE = re.compile(rb'^(\S+)\s*:\s*(.*)$', re.M)
+
+# A section header or "Key = Value" line, split at the first '=', without
+# surrounding whitespace (the key keeps any before the '='); lines end at \n,
+# \r\n or a lone \r. Anything else (blank lines, comments, other text) never
+# matches. Greedy runs that back off to the last non-space keep this linear
+_LINE_RE = re.compile(
+    rb'(?<![^\r\n])[ \t\f\v]*'
+    rb'(?:\[(?P<sec>(?i:interface|peer))\]'
+    rb'|(?P<line>(?![\s#])(?P<key>[^=\r\n]*)=(?:[ \t\f\v]*(?P<val>\S(?:[^\r\n]*\S)?))?))'
+    rb'[ \t\f\v]*(?![^\r\n])'
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """shutil.which, resolved once per process"""
+    return shutil.which(name)
+
+
+def _decode_output(out: bytes, err: bytes) -> str:
+    """Command output for an error message; only failures pay for decoding"""
+    return f"{out.decode('utf-8', 'replace')}\n{err.decode('utf-8', 'replace')}".strip()
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum"""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+# ICMP header (type, code, checksum, id, seq) and the send time we put in
+# the echo payload, which the reply carries back
+_ICMP_HDR = struct.Struct('!BBHHH')
+_ICMP_STAMP = struct.Struct('<Q')
+
+
+def _icmp_echo(ident: int, seq: int) -> bytes:
+    """ICMP echo request (type 8) with a 56-byte payload, like ping"""
+    payload = _ICMP_STAMP.pack(time.perf_counter_ns()).ljust(56, b'\0')
+    checksum = _icmp_checksum(_ICMP_HDR.pack(8, 0, 0, ident, seq) + payload)
+    return _ICMP_HDR.pack(8, 0, checksum, ident, seq) + payload
+
+
+@functools.lru_cache(maxsize=None)
+def _is_admin() -> bool:
+    if _IS_WINDOWS:
+        try:
+            import ctypes
+            return ctypes.windll.shell32.IsUserAnAdmin() != 0
+        except:
+            return False
+    return os.geteuid() == 0
 
 
 # =============================================================================
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+# __slots__ for the many short-lived records (dataclass slots need Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+# Frozen + slots only from 3.11, where pickling them to pool workers is known good
+_FROZEN_SLOTS = {'slots': True} if sys.version_info >= (3, 11) else {}
+
+
+# The AWG parameter block, formatted straight to bytes for the file writes
+_AWG_BLOCK_FMT = (b"Jc = %d\nJmin = %d\nJmax = %d\nS1 = %d\nS2 = %d\n"
+                  b"H1 = %d\nH2 = %d\nH3 = %d\nH4 = %d")
+
+
+# Sweeps repeat the same parameter sets (recommended configs, shared H1-H4),
+# so the rendered block is cached per parameter tuple
+@functools.lru_cache(maxsize=4096)
+def _awg_block_bytes(*values: int) -> bytes:
+    return _AWG_BLOCK_FMT % values
+
+
+@functools.lru_cache(maxsize=4096)
+def _awg_short_name(jc: int, jmin: int, jmax: int, s1: int, s2: int) -> str:
+    return f"Jc{jc}_Jmin{jmin}_Jmax{jmax}_S1{s1}_S2{s2}"
+
+
+@dataclass(frozen=True, **_FROZEN_SLOTS)
 class AWGParams:
-    """AmneziaWG obfuscation parameters"""
+    """AmneziaWG obfuscation parameters; immutable, so sets can be shared"""
     Jc: int = 0
     Jmin: int = 40
     Jmax: int = 70
@@ -39,30 +151,20 @@ class AWGParams:
     H4: int = 4
 
     def to_dict(self) -> Dict[str, int]:
-        return vars(self).copy()
-
-    def to_config_lines(self) -> List[str]:
-        return [
-            f"Jc = {self.Jc}",
-            f"Jmin = {self.Jmin}",
-            f"Jmax = {self.Jmax}",
-            f"S1 = {self.S1}",
-            f"S2 = {self.S2}",
-            f"H1 = {self.H1}",
-            f"H2 = {self.H2}",
-            f"H3 = {self.H3}",
-            f"H4 = {self.H4}",
-        ]
+        return {name: getattr(self, name) for name in _AWG_FIELDS}
+
+    def to_config_bytes(self) -> bytes:
+        return _awg_block_bytes(self.Jc, self.Jmin, self.Jmax, self.S1, self.S2,
+                                self.H1, self.H2, self.H3, self.H4)
 
     def short_name(self) -> str:
-        return f"Jc{self.Jc}_Jmin{self.Jmin}_Jmax{self.Jmax}_S1{self.S1}_S2{self.S2}"
+        return _awg_short_name(self.Jc, self.Jmin, self.Jmax, self.S1, self.S2)
 
     def copy(self, **kwargs) -> 'AWGParams':
-        params = AWGParams(**vars(self))
-        for key, value in kwargs.items():
-            if hasattr(params, key):
-                setattr(params, key, value)
-        return params
+        return replace(self, **{k: v for k, v in kwargs.items() if k in _AWG_FIELDS})
+
+
+_AWG_FIELDS = tuple(f.name for f in fields(AWGParams))
 
 
 @dataclass
@@ -78,13 +180,25 @@ class WGConfig:
     dns: str = ""
     endpoint: str = ""
     public_key: str = ""
+    # (bytes before, bytes after) the AWG parameters, shared by every generator
+    _skeleton: Optional[Tuple[bytes, bytes]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
+    def skeleton(self) -> Tuple[bytes, bytes]:
+        """Interface/peer bytes around the AWG block, encoded once per config"""
+        if self._skeleton is None:
+            head = '\n'.join(["[Interface]", *self.interface_lines, "", ""])
+            tail = '\n'.join(["", "", "[Peer]", *self.peer_lines])
+            self._skeleton = (head.encode('utf-8'), tail.encode('utf-8'))
+        return self._skeleton
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class TestResult:
     """Test result"""
     config_name: str
-    params: Dict[str, int]
+    params: AWGParams
     success: bool = False
     handshake_ok: bool = False
     ping_avg_ms: float = 0.0
@@ -94,6 +208,30 @@ class TestResult:
     error: str = ""
     timestamp: str = ""
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON record, keyed by the names used in the results file"""
+        return {
+            'name': self.config_name,
+            'params': self.params.to_dict(),
+            'success': self.success,
+            'handshake': self.handshake_ok,
+            'ping_avg': self.ping_avg_ms,
+            'ping_min': self.ping_min_ms,
+            'ping_max': self.ping_max_ms,
+            'loss': self.packet_loss,
+            'error': self.error
+        }
+
+
+def _rank_key(result: TestResult) -> float:
+    """Sort key for handshaking results: lower is better, no ping is last"""
+    if result.ping_avg_ms <= 0:
+        return 9999
+    # Each percent of loss counts as a millisecond of ping, so a lossy but
+    # fast config does not outrank a clean one. Plain Python on purpose: it
+    # runs once per tested config, far too rarely for a JIT to pay off
+    return result.ping_avg_ms + result.packet_loss
+
 
 # =============================================================================
 # CONFIG PARSER
@@ -103,63 +241,72 @@ class ConfigParser:
     """Parse WireGuard/AmneziaWG configuration files"""
     
     AWG_PARAMS = {'Jc', 'Jmin', 'Jmax', 'S1', 'S2', 'H1', 'H2', 'H3', 'H4'}
+    # Lowercased key -> WGConfig attribute, per section
+    SECTION_FIELDS = {
+        'interface': {'privatekey': 'private_key', 'address': 'address', 'dns': 'dns'},
+        'peer': {'publickey': 'public_key', 'endpoint': 'endpoint'},
+    }
 
     @classmethod
     def parse(cls, filepath: str) -> WGConfig:
         path = Path(filepath)
         config = WGConfig(name=path.stem, filepath=str(path))
         
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # A bare fd is enough to map the file; no buffered file object needed
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file, nothing to map
+            return config
+        finally:
+            os.close(fd)
+        
+        with mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            cls._parse_text(config, mm)
         
+        return config
+    
+    @classmethod
+    def _parse_text(cls, config: WGConfig, data):
+        """Fill config from the raw bytes of a config file (or an mmap of one)"""
         section = None
-        for line in content.split('\n'):
-            line = line.strip()
-            
-            if not line or line.startswith('#'):
+        params: Dict[str, int] = {}
+        # One C-level scan over the whole file; groups come back as tuples
+        # (b'' when absent) and only the lines we keep are decoded
+        for sec, line, key, value in _LINE_RE.findall(data):
+            if sec:
+                section = sec.lower().decode()
                 continue
             
-            if line.lower() == '[interface]':
-                section = 'interface'
-                continue
-            elif line.lower() == '[peer]':
-                section = 'peer'
-                continue
-            
-            if '=' not in line:
-                continue
-                
-            key, value = [x.strip() for x in line.split('=', 1)]
+            key = key.rstrip().decode('utf-8', 'replace')
             
             if key in cls.AWG_PARAMS:
                 try:
-                    setattr(config.params, key, int(value))
+                    params[key] = int(value)
                 except ValueError:
                     pass
                 continue
             
             if section == 'interface':
-                config.interface_lines.append(line)
-                key_lower = key.lower()
-                if key_lower == 'privatekey':
-                    config.private_key = value
-                elif key_lower == 'address':
-                    config.address = value
-                elif key_lower == 'dns':
-                    config.dns = value
-                    
+                config.interface_lines.append(line.decode('utf-8', 'replace'))
             elif section == 'peer':
-                config.peer_lines.append(line)
-                key_lower = key.lower()
-                if key_lower == 'publickey':
-                    config.public_key = value
-                elif key_lower == 'endpoint':
-                    config.endpoint = value
+                config.peer_lines.append(line.decode('utf-8', 'replace'))
+            else:
+                continue
+            
+            field_name = cls.SECTION_FIELDS[section].get(key.lower())
+            if field_name:
+                setattr(config, field_name, value.decode('utf-8', 'replace'))
         
-        return config
+        # AWGParams is frozen, so it is built once from what was found
+        if params:
+            config.params = AWGParams(**params)
 
     @classmethod
-    def parse_directory(cls, dirpath: str) -> List[WGConfig]:
+    def parse_directory(cls, dirpath: str, verbose: bool = True) -> List[WGConfig]:
         configs = []
         path = Path(dirpath)
         
@@ -167,17 +314,29 @@ class ConfigParser:
             print(f"❌ Directory not found: {dirpath}")
             return configs
         
-        for conf_file in sorted(path.glob('*.conf')):
+        # Collected and written at once; errors are listed even when not verbose
+        out = []
+        # One directory scan; scandir entries know their type without a stat
+        with os.scandir(path) as entries:
+            conf_files = sorted(
+                (entry.name, entry.path) for entry in entries
+                if os.path.normcase(entry.name).endswith('.conf') and entry.is_file()
+            )
+        for name, conf_file in conf_files:
             try:
-                config = cls.parse(str(conf_file))
+                config = cls.parse(conf_file)
                 configs.append(config)
-                print(f"  ✓ {conf_file.name}")
-                p = config.params
-                print(f"    Jc={p.Jc}, Jmin={p.Jmin}, Jmax={p.Jmax}, "
-                      f"S1={p.S1}, S2={p.S2}")
-                print(f"    H1={p.H1}, H2={p.H2}, H3={p.H3}, H4={p.H4}")
+                if verbose:
+                    p = config.params
+                    out.append(f"  ✓ {name}")
+                    out.append(f"    Jc={p.Jc}, Jmin={p.Jmin}, Jmax={p.Jmax}, "
+                               f"S1={p.S1}, S2={p.S2}")
+                    out.append(f"    H1={p.H1}, H2={p.H2}, H3={p.H3}, H4={p.H4}")
             except Exception as e:
-                print(f"  ✗ {conf_file.name}: {e}")
+                out.append(f"  ✗ {name}: {e}")
+        
+        if out:
+            sys.stdout.write('\n'.join(out) + '\n')
         
         return configs
 
@@ -189,34 +348,161 @@ class ConfigParser:
 class ConfigGenerator:
     """Generate config variations"""
     
+    # "<digest> <filename>" per file written, so a later run over the same
+    # output directory can leave unchanged files alone
+    HASHES_FILE = ".hashes"
+    
     def __init__(self, output_dir: str):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Files are created relative to an open directory fd (openat), so the
+        # output path is resolved once rather than per file
+        self._dir_fd: Optional[int] = None
+        if os.open in os.supports_dir_fd:
+            self._dir_fd = os.open(self.output_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        
+        self._hashes = self._load_hashes()
+        self._hashes_changed = False
+    
+    def _load_hashes(self) -> Dict[str, str]:
+        try:
+            text = (self.output_dir / self.HASHES_FILE).read_text()
+        except (OSError, UnicodeDecodeError):
+            return {}
+        return {name: digest for digest, _, name in
+                (line.partition(' ') for line in text.splitlines()) if name}
+    
+    def close(self):
+        if self._hashes_changed:
+            self._hashes_changed = False
+            (self.output_dir / self.HASHES_FILE).write_text(''.join(
+                f"{digest} {name}\n" for name, digest in sorted(self._hashes.items())
+            ))
+        if self._dir_fd is not None:
+            os.close(self._dir_fd)
+            self._dir_fd = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def render_bytes(self, base_config: WGConfig, params: AWGParams) -> bytes:
+        """Config file contents for a parameter set, ready for os.write"""
+        head, tail = base_config.skeleton()
+        return b''.join((head, params.to_config_bytes(), tail))
+    
+    def render(self, base_config: WGConfig, params: AWGParams) -> str:
+        """Config text for a parameter set, from the parsed base config"""
+        return self.render_bytes(base_config, params).decode('utf-8')
     
     def generate(self, base_config: WGConfig, params: AWGParams, suffix: str = "") -> str:
-        lines = ["[Interface]"]
-        lines.extend(base_config.interface_lines)
-        lines.append("")
-        lines.extend(params.to_config_lines())
-        lines.append("")
-        lines.append("[Peer]")
-        lines.extend(base_config.peer_lines)
-        
-        if suffix:
-            filename = f"{base_config.name}_{suffix}.conf"
-        else:
-            filename = f"{base_config.name}_{params.short_name()}.conf"
+        return self._writer(base_config)(params, suffix)
+    
+    def _writer(self, base_config: WGConfig) -> Callable[..., str]:
+        """generate() for one base config, with its fixed parts bound once"""
+        name = base_config.name
+        head, tail = base_config.skeleton()
+        # Hash state after the head; each file continues from a copy of it
+        head_digest = hashlib.blake2b(head, digest_size=16)
+        
+        def write(params: AWGParams, suffix: str = "") -> str:
+            filename = f"{name}_{suffix or params.short_name()}.conf"
+            block = params.to_config_bytes()
+            digest = head_digest.copy()
+            digest.update(block)
+            digest.update(tail)
+            return self._store(filename, (head, block, tail), digest.hexdigest())
         
+        return write
+    
+    def _store(self, filename: str, parts: Tuple[bytes, ...], digest: str) -> str:
         filepath = self.output_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        # A previous run wrote these contents there, and the file still
+        # has them (it may have been edited since): keep it
+        if self._hashes.get(filename) == digest and self._digest_on_disk(filename) == digest:
+            return str(filepath)
         
-        if platform.system() != "Windows":
-            os.chmod(filepath, 0o600)
+        if _IS_WINDOWS:
+            # Mode bits don't apply; text mode keeps the CRLF line endings
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(b''.join(parts).decode('utf-8'))
+        else:
+            self._write_conf(filename, parts)
         
+        self._hashes[filename] = digest
+        self._hashes_changed = True
         return str(filepath)
     
+    def _digest_on_disk(self, filename: str) -> Optional[str]:
+        """blake2b digest of a file in the output directory, None if unreadable"""
+        flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+        try:
+            if self._dir_fd is not None:
+                fd = os.open(filename, flags, dir_fd=self._dir_fd)
+            else:
+                fd = os.open(self.output_dir / filename, flags)
+            with os.fdopen(fd, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if _IS_WINDOWS:
+            data = data.replace(b'\r\n', b'\n')  # written in text mode
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _write_conf(self, filename: str, parts: Tuple[bytes, ...]):
+        """Write a file in the output directory from its parts (POSIX)"""
+        # Create with 0600 directly instead of a separate chmod
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        if self._dir_fd is not None:
+            fd = os.open(filename, flags, 0o600, dir_fd=self._dir_fd)
+        else:
+            fd = os.open(self.output_dir / filename, flags, 0o600)
+        try:
+            # Gathered by the kernel, so the parts are normally never joined;
+            # after a short write (e.g. a nearly full disk) finish the rest
+            written = os.writev(fd, parts)
+            if written < sum(map(len, parts)):
+                rest = memoryview(b''.join(parts))[written:]
+                while rest:
+                    rest = rest[os.write(fd, rest):]
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def grid_size(
+        jc_values: List[int],
+        jmin_values: List[int],
+        jmax_values: List[int],
+        s1_values: List[int],
+        s2_values: List[int]
+    ) -> int:
+        """Number of variations per base config, without building them"""
+        pairs = sum(jmax > jmin for jmin in jmin_values for jmax in jmax_values)
+        return pairs * len(jc_values) * len(s1_values) * len(s2_values)
+    
+    @staticmethod
+    def _iter_grid(
+        jc_values: List[int],
+        jmin_values: List[int],
+        jmax_values: List[int],
+        s1_values: List[int],
+        s2_values: List[int],
+        h1: int, h2: int, h3: int, h4: int
+    ) -> Iterator[AWGParams]:
+        # Jmax must exceed Jmin, so filter that pair before expanding the
+        # remaining axes; invalid combinations are never built or written
+        pairs = [(jmin, jmax) for jmin in jmin_values for jmax in jmax_values if jmax > jmin]
+        for (jmin, jmax), jc, s1, s2 in itertools.product(pairs, jc_values, s1_values, s2_values):
+            yield AWGParams(
+                Jc=jc, Jmin=jmin, Jmax=jmax,
+                S1=s1, S2=s2,
+                H1=h1, H2=h2, H3=h3, H4=h4
+            )
+    
     def generate_variations(
         self,
         base_config: WGConfig,
@@ -227,24 +513,80 @@ class ConfigGenerator:
         s2_values: List[int],
         h1: int, h2: int, h3: int, h4: int
     ) -> List[Tuple[str, AWGParams]]:
-        variations = []
+        grid = self._iter_grid(
+            jc_values, jmin_values, jmax_values, s1_values, s2_values,
+            h1, h2, h3, h4
+        )
         
-        for jc, jmin, jmax, s1, s2 in product(
-            jc_values, jmin_values, jmax_values, s1_values, s2_values
-        ):
-            if jmax <= jmin:
+        writer = self._writer(base_config)
+        
+        def write(params: AWGParams) -> Tuple[str, AWGParams]:
+            return writer(params), params
+        
+        return list(map(write, grid))
+
+
+# =============================================================================
+# ADAPTIVE SWEEP
+# =============================================================================
+
+class AdaptiveSweepScheduler:
+    """Sweep one parameter at a time, holding the others at the best so far"""
+    
+    ORDER = ('Jc', 'Jmin', 'Jmax', 'S1', 'S2')
+    
+    def __init__(
+        self,
+        generator: ConfigGenerator,
+        base_config: WGConfig,
+        values: Dict[str, List[int]],
+        start: AWGParams
+    ):
+        self.generator = generator
+        self.base_config = base_config
+        self.values = values
+        self.best = start
+        self.best_result: Optional[TestResult] = None
+        # Parameter set -> result, so the incumbent is never retested
+        self.tested: Dict[AWGParams, TestResult] = {}
+    
+    def run(
+        self,
+        evaluate: Callable[[List[Tuple[str, AWGParams]]], List[TestResult]]
+    ) -> Optional[TestResult]:
+        """Tests about sum(len(values)) variations instead of their product"""
+        for name in self.ORDER:
+            candidates = []
+            for value in self.values[name]:
+                params = self.best.copy(**{name: value})
+                if params.Jmax <= params.Jmin or params in self.tested:
+                    continue
+                filepath = self.generator.generate(self.base_config, params)
+                candidates.append((filepath, params))
+            
+            if not candidates:
                 continue
             
-            params = AWGParams(
-                Jc=jc, Jmin=jmin, Jmax=jmax,
-                S1=s1, S2=s2,
-                H1=h1, H2=h2, H3=h3, H4=h4
-            )
+            print(f"\n  Sweeping {name}: {[getattr(p, name) for _, p in candidates]} "
+                  f"(others from {self.best.short_name()})")
+            results = evaluate(candidates)
+            
+            for result in results:
+                self.tested[result.params] = result
+                if result.handshake_ok and (
+                    self.best_result is None
+                    or _rank_key(result) < _rank_key(self.best_result)
+                ):
+                    self.best_result = result
+            
+            if self.best_result is not None:
+                self.best = self.best_result.params
             
-            filepath = self.generate(base_config, params)
-            variations.append((filepath, params))
+            # Fewer results than candidates means the sweep was stopped
+            if len(results) < len(candidates):
+                break
         
-        return variations
+        return self.best_result
 
 
 # =============================================================================
@@ -255,16 +597,20 @@ class AWGDetector:
     """Detect and validate AmneziaWG installation"""
     
     def __init__(self):
-        self.system = platform.system()
         self.awg_quick = None
         self.awg_show = None
         self.is_awg = False
         
+        # Resolved once here so workers never search PATH themselves
+        self.ping = _which("ping") or "ping"
+        self.fping = _which("fping")
+        self.ip = _which("ip") or "ip"
+        
         self._detect()
     
     def _detect(self):
         """Detect AmneziaWG tools"""
-        if self.system == "Windows":
+        if _IS_WINDOWS:
             self._detect_windows()
         else:
             self._detect_linux()
@@ -272,23 +618,23 @@ class AWGDetector:
     def _detect_linux(self):
         """Detect on Linux"""
         # Check for awg-quick (AmneziaWG)
-        awg_quick = shutil.which("awg-quick")
+        awg_quick = _which("awg-quick")
         if awg_quick:
             self.awg_quick = awg_quick
             self.is_awg = True
         else:
             # Fallback to wg-quick (will fail with AWG params!)
-            wg_quick = shutil.which("wg-quick")
+            wg_quick = _which("wg-quick")
             if wg_quick:
                 self.awg_quick = wg_quick
                 self.is_awg = False
         
         # Check for awg show command
-        awg = shutil.which("awg")
+        awg = _which("awg")
         if awg:
             self.awg_show = awg
         else:
-            wg = shutil.which("wg")
+            wg = _which("wg")
             if wg:
                 self.awg_show = wg
     
@@ -378,183 +724,606 @@ class AWGDetector:
 class ConfigTester:
     """Test WireGuard configurations"""
     
-    def __init__(self, interface: str = "awg-test", detector: AWGDetector = None):
+    # Control sockets of the userspace implementations (amneziawg-go, wireguard-go)
+    UAPI_DIRS = ('/var/run/amneziawg', '/var/run/wireguard')
+    # awg-quick settings that awg setconf rejects
+    QUICK_ONLY_KEYS = frozenset({
+        'address', 'dns', 'mtu', 'table',
+        'preup', 'postup', 'predown', 'postdown', 'saveconfig'
+    })
+    # ping flags for this platform: the count option, then the rest before
+    # the target (sub-second intervals are allowed for root on Linux)
+    PING_COUNT_FLAG = "-n" if _IS_WINDOWS else "-c"
+    PING_OPTS = (() if _IS_WINDOWS else
+                 ("-i", "0.2", "-W", "2") if _SYSTEM == "Linux" else
+                 ("-W", "2"))
+    # Most ping processes _ping_all runs at once
+    MAX_PING_PROCS = 64
+    
+    def __init__(
+        self,
+        detector: AWGDetector,
+        interface: str = "awg-test",
+        netns: Optional[str] = None,
+        reuse_interface: bool = False
+    ):
         self.interface = interface
-        self.system = platform.system()
-        self.detector = detector or AWGDetector()
-        self.is_admin = self._check_admin()
+        self.netns_cmd = [detector.ip, "netns", "exec", netns] if netns else []
+        # The tester owns its namespace; made here unless it already exists
+        if netns and not os.path.exists(f"/run/netns/{netns}"):
+            _add_netns([netns], detector.ip)
+        self.detector = detector
+        self.is_admin = _is_admin()
         
         self.awg_quick = self.detector.awg_quick
         self.awg_show = self.detector.awg_show
+        self.ping = self.detector.ping
+        self.fping = self.detector.fping
+        
+        # With reuse_interface, the config (minus AWG params) the live
+        # interface was brought up with; None while it is down
+        self.reuse_interface = reuse_interface and not _IS_WINDOWS
+        self._live_base: Optional[str] = None
     
-    def _check_admin(self) -> bool:
-        if self.system == "Windows":
-            try:
-                import ctypes
-                return ctypes.windll.shell32.IsUserAnAdmin() != 0
-            except:
-                return False
-        return os.geteuid() == 0
-    
-    def _run(self, cmd: List[str], timeout: int = 30) -> Tuple[int, str, str]:
+    def _run(self, cmd: List[str], timeout: int = 30, text: bool = False) -> Tuple[int, Any, Any]:
+        """Run a command; output is raw bytes, or str when text is True"""
+        cmd = self.netns_cmd + cmd
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            # An absolute program path and close_fds=False let CPython spawn
+            # with posix_spawn (vfork) instead of fork+exec; fds opened by
+            # Python are non-inheritable, so nothing extra leaks to the child
+            if not os.path.isabs(cmd[0]):
+                cmd = [_which(cmd[0]) or cmd[0], *cmd[1:]]
+            result = subprocess.run(
+                cmd, capture_output=True, text=text, timeout=timeout, close_fds=False
+            )
             return result.returncode, result.stdout, result.stderr
         except subprocess.TimeoutExpired:
-            return -1, "", "Timeout"
+            error = "Timeout"
         except Exception as e:
-            return -1, "", str(e)
+            error = str(e)
+        if text:
+            return -1, "", error
+        return -1, b"", error.encode()
     
-    def _up(self, config_path: str) -> Tuple[bool, str]:
-        """Bring up interface"""
-        config_name = Path(config_path).stem
+    def _spawn_quiet(self, cmd: List[str], timeout: int = 30) -> int:
+        """Run a command whose output is not needed; returns the exit code"""
+        if not hasattr(os, 'pidfd_open'):
+            return self._run(cmd, timeout)[0]
         
+        # posix_spawn straight onto /dev/null: no pipes to set up and drain,
+        # and the pidfd lets us wait with a timeout without polling
+        cmd = self.netns_cmd + cmd
+        devnull = os.open(os.devnull, os.O_RDWR)
         try:
-            if self.system == "Windows":
-                # Windows with AmneziaWG
-                self._run(["wireguard", "/uninstalltunnelservice", config_name], 10)
-                time.sleep(1)
-                
-                # For AmneziaWG on Windows, use the AmneziaWG service
-                if self.detector.is_awg:
-                    code, out, err = self._run(
-                        ["wireguard", "/installtunnelservice", config_path], 30
-                    )
-                else:
-                    code, out, err = self._run(
-                        ["wireguard", "/installtunnelservice", config_path], 30
-                    )
-                
-                if code != 0:
-                    return False, f"Install failed: {err}"
-            else:
-                # Linux
-                # Bring down existing
-                self._run([self.awg_quick, "down", self.interface], 10)
-                time.sleep(1)
-                
-                # Copy config to /etc/wireguard (or /etc/amnezia/amneziawg)
-                if self.detector.is_awg:
-                    # Try AmneziaWG config directory first
-                    target_dirs = [
-                        f"/etc/amnezia/amneziawg/{self.interface}.conf",
-                        f"/etc/wireguard/{self.interface}.conf"
-                    ]
-                else:
-                    target_dirs = [f"/etc/wireguard/{self.interface}.conf"]
-                
-                target = target_dirs[0]
-                
-                # Create directory if needed
-                os.makedirs(os.path.dirname(target), exist_ok=True)
-                
-                shutil.copy(config_path, target)
-                os.chmod(target, 0o600)
-                
-                # Bring up
-                code, out, err = self._run([self.awg_quick, "up", self.interface], 30)
-                
-                if code != 0:
-                    # Full error output for debugging
-                    full_error = f"{out}\n{err}".strip()
-                    return False, full_error
+            if not os.path.isabs(cmd[0]):
+                cmd = [_which(cmd[0]) or cmd[0], *cmd[1:]]
+            pid = os.posix_spawn(cmd[0], cmd, os.environ, file_actions=[
+                (os.POSIX_SPAWN_DUP2, devnull, 0),
+                (os.POSIX_SPAWN_DUP2, devnull, 1),
+                (os.POSIX_SPAWN_DUP2, devnull, 2),
+            ])
+        except Exception:
+            return -1
+        finally:
+            os.close(devnull)
+        
+        try:
+            pidfd = os.pidfd_open(pid)
+        except OSError:
+            # Built with pidfd_open, but the kernel (< 5.3) or a seccomp
+            # profile refuses it: the child is running, so poll for it
+            return self._wait_polling(pid, timeout)
+        try:
+            if not select.select([pidfd], [], [], timeout)[0]:
+                os.kill(pid, signal.SIGKILL)
+            _, status = os.waitpid(pid, 0)
+            return os.waitstatus_to_exitcode(status)
+        finally:
+            os.close(pidfd)
+    
+    @staticmethod
+    def _wait_polling(pid: int, timeout: float) -> int:
+        """Reap a child within timeout (killing it after), without a pidfd"""
+        deadline = time.monotonic() + timeout
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return os.waitstatus_to_exitcode(status)
+            if time.monotonic() >= deadline:
+                os.kill(pid, signal.SIGKILL)
+                _, status = os.waitpid(pid, 0)
+                return os.waitstatus_to_exitcode(status)
+            time.sleep(0.05)
+    
+    def _up_windows(self, config_path: str, config_name: str) -> Tuple[bool, str]:
+        """Bring up interface (Windows with AmneziaWG)"""
+        try:
+            self._spawn_quiet(["wireguard", "/uninstalltunnelservice", config_name], 10)
+            time.sleep(1)
+            
+            # Text mode: wireguard.exe reports in the console code page
+            code, out, err = self._run(
+                ["wireguard", "/installtunnelservice", config_path], 30, text=True
+            )
+            
+            if code != 0:
+                return False, f"Install failed: {err}"
             
-            time.sleep(3)  # Wait for handshake
+            self._wait_handshake()
             return True, ""
             
         except Exception as e:
             return False, str(e)
     
-    def _down(self, config_path: str = None):
-        """Bring down interface"""
+    def _up_unix(self, config_path: str, config_name: str) -> Tuple[bool, str]:
+        """Bring up interface (Linux/macOS awg-quick)"""
         try:
-            if self.system == "Windows" and config_path:
-                config_name = Path(config_path).stem
-                self._run(["wireguard", "/uninstalltunnelservice", config_name], 10)
+            if self.reuse_interface:
+                conf, base = self._split_config(config_path)
+                if base == self._live_base:
+                    return self._setconf(conf)
+            
+            # Bring down existing
+            self._live_base = None
+            self._spawn_quiet([self.awg_quick, "down", self.interface], 10)
+            time.sleep(1)
+            
+            # Copy config to /etc/wireguard (or /etc/amnezia/amneziawg)
+            if self.detector.is_awg:
+                # Try AmneziaWG config directory first
+                target_dirs = [
+                    f"/etc/amnezia/amneziawg/{self.interface}.conf",
+                    f"/etc/wireguard/{self.interface}.conf"
+                ]
             else:
-                self._run([self.awg_quick, "down", self.interface], 10)
-                
-                # Cleanup config files
-                for target in [
-                    f"/etc/wireguard/{self.interface}.conf",
-                    f"/etc/amnezia/amneziawg/{self.interface}.conf"
-                ]:
-                    if os.path.exists(target):
-                        os.remove(target)
+                target_dirs = [f"/etc/wireguard/{self.interface}.conf"]
+            
+            target = target_dirs[0]
+            
+            # Create directory if needed
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            
+            shutil.copy(config_path, target)
+            os.chmod(target, 0o600)
+            
+            # Bring up
+            code, out, err = self._run([self.awg_quick, "up", self.interface], 30)
+            
+            if code != 0:
+                # Full error output for debugging
+                return False, _decode_output(out, err)
+            
+            if self.reuse_interface:
+                self._live_base = base
+            
+            self._wait_handshake()
+            return True, ""
+        
+        except Exception as e:
+            return False, str(e)
+    
+    # Picked once for the platform rather than re-checked on every test
+    _up = _up_windows if _IS_WINDOWS else _up_unix
+    
+    def _split_config(self, config_path: str) -> Tuple[str, str]:
+        """(text for awg setconf, everything but the AWG params)"""
+        with open(config_path) as f:
+            lines = f.read().splitlines()
+        
+        conf, base = [], []
+        for line in lines:
+            key = line.split('=', 1)[0].strip() if '=' in line else ''
+            if key.lower() not in self.QUICK_ONLY_KEYS:
+                conf.append(line)
+            if key not in ConfigParser.AWG_PARAMS:
+                base.append(line)
+        return '\n'.join(conf) + '\n', '\n'.join(base)
+    
+    def _setconf(self, conf: str) -> Tuple[bool, str]:
+        """Swap the AWG params of the live interface; addresses and routes stay"""
+        # The config holds the private key: a fresh 0600 file (O_EXCL, random
+        # name), never a predictable path someone else could have planted
+        fd, path = tempfile.mkstemp(prefix=f"{self.interface}.", suffix=".setconf")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(conf.encode())
+            # Replacing the peer forces a fresh handshake with the new params
+            code, out, err = self._run([self.awg_show, "setconf", self.interface, path], 10)
+        finally:
+            os.remove(path)
+        if code != 0:
+            return False, f"setconf failed: {_decode_output(out, err)}"
+        
+        self._wait_handshake()
+        return True, ""
+    
+    def close(self):
+        """Bring down an interface kept up by reuse_interface"""
+        if self._live_base is not None:
+            self._live_base = None
+            self._down()
+    
+    def _down_unix(self, config_name: str = None):
+        """Bring down interface"""
+        try:
+            self._spawn_quiet([self.awg_quick, "down", self.interface], 10)
+            
+            # Cleanup config files
+            for target in [
+                f"/etc/wireguard/{self.interface}.conf",
+                f"/etc/amnezia/amneziawg/{self.interface}.conf"
+            ]:
+                if os.path.exists(target):
+                    os.remove(target)
         except:
             pass
     
+    def _down_windows(self, config_name: str = None):
+        """Bring down interface (uninstall the tunnel service)"""
+        if not config_name:
+            return self._down_unix()
+        try:
+            self._spawn_quiet(["wireguard", "/uninstalltunnelservice", config_name], 10)
+        except:
+            pass
+    
+    _down = _down_windows if _IS_WINDOWS else _down_unix
+    
+    def _wait_handshake(self, timeout: float = 3.0):
+        """Wait for the handshake; returns early once the UAPI socket reports one"""
+        deadline = time.monotonic() + timeout
+        if not _IS_WINDOWS:
+            while time.monotonic() < deadline:
+                handshake = self._check_handshake_unix()
+                if handshake is None:
+                    break  # no UAPI socket (kernel module), just wait it out
+                if handshake:
+                    return
+                time.sleep(0.1)
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    
+    def _check_handshake_unix(self) -> Optional[bool]:
+        """Read the handshake time over the UAPI socket; None if there is none"""
+        for directory in self.UAPI_DIRS:
+            path = os.path.join(directory, f"{self.interface}.sock")
+            if not os.path.exists(path):
+                continue
+            
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(2)
+                    sock.connect(path)
+                    sock.sendall(b"get=1\n\n")
+                    data = b""
+                    while not data.endswith(b"\n\n"):
+                        chunk = sock.recv(4096)
+                        if not chunk:
+                            break
+                        data += chunk
+            except OSError:
+                return None
+            
+            for line in data.split(b"\n"):
+                if line.startswith(b"last_handshake_time_sec="):
+                    if line != b"last_handshake_time_sec=0":
+                        return True
+            return False
+        return None
+    
     def _check_handshake(self) -> bool:
         """Check if handshake completed"""
         try:
-            if self.system == "Windows":
+            if _IS_WINDOWS:
                 code, out, _ = self._run([self.awg_show, "show"], 5)
             else:
+                # Userspace implementations answer without spawning awg
+                handshake = self._check_handshake_unix()
+                if handshake is not None:
+                    return handshake
                 code, out, _ = self._run([self.awg_show, "show", self.interface], 5)
-            return "latest handshake" in out.lower()
+            return b"latest handshake" in out.lower()
         except:
             return False
     
+    def _icmp_ping(
+        self,
+        targets: List[str],
+        count: int,
+        timeout: float = 2.0
+    ) -> Optional[List[Tuple[List[float], float]]]:
+        """Ping every target over one raw ICMP socket; None if that fails"""
+        # Each echo needs its own 16-bit seq number
+        if count * len(targets) > 0x10000:
+            return None
+        try:
+            addrs = [socket.gethostbyname(target) for target in targets]
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        except OSError:
+            return None
+        
+        # Raw sockets see every ICMP reply, so match on source, id and seq;
+        # seq numbers are unique across targets
+        ident = (os.getpid() ^ id(sock)) & 0xFFFF
+        pending: Dict[int, int] = {}  # seq -> target index
+        times: List[List[float]] = [[] for _ in targets]
+        # Any send/receive error (e.g. no route) leaves it to the ping fallback
+        try:
+            with sock:
+                # Send every echo up front, then collect the replies as they come:
+                # the whole run takes about one RTT instead of count per target
+                for index, addr in enumerate(addrs):
+                    for n in range(count):
+                        seq = index * count + n
+                        pending[seq] = index
+                        sock.sendto(_icmp_echo(ident, seq), (addr, 0))
+                deadline = time.perf_counter() + timeout
+                
+                while pending:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                        break
+                    data, (source, _) = sock.recvfrom(1024)
+                    received = time.perf_counter_ns()
+                    offset = (data[0] & 0x0F) * 4  # skip the IP header
+                    if len(data) < offset + 16:
+                        continue
+                    kind, _, _, reply_ident, seq = _ICMP_HDR.unpack_from(data, offset)
+                    if (kind == 0 and reply_ident == ident and seq in pending
+                            and source == addrs[pending[seq]]):
+                        sent = _ICMP_STAMP.unpack_from(data, offset + 8)[0]
+                        times[pending.pop(seq)].append((received - sent) / 1e6)
+        except (OSError, struct.error):
+            return None
+        
+        return [(run, self._loss(run, count)) for run in times]
+    
+    @staticmethod
+    def _loss(times: List[float], count: int) -> float:
+        return ((count - len(times)) / count) * 100 if count > 0 else 100
+    
+    def _ping_cmd(self, target: str, count: int) -> List[str]:
+        return [self.ping, self.PING_COUNT_FLAG, str(count), *self.PING_OPTS, target]
+    
     def _ping_test(self, target: str, count: int) -> Tuple[List[float], float]:
         """Run ping test"""
         try:
-            if self.system == "Windows":
-                cmd = ["ping", "-n", str(count), target]
-            else:
-                cmd = ["ping", "-c", str(count), "-W", "2", target]
-            
-            code, out, _ = self._run(cmd, count * 3 + 10)
-            
-            times = []
-            for line in out.split('\n'):
-                match = re.search(r'time[=<](\d+\.?\d*)', line.lower())
-                if match:
-                    times.append(float(match.group(1)))
-            
-            loss = ((count - len(times)) / count) * 100 if count > 0 else 100
-            return times, loss
+            code, out, _ = self._run(self._ping_cmd(target, count), count * 3 + 10)
+            times = list(map(float, _PING_RE.findall(out)))
+            return times, self._loss(times, count)
             
         except:
             return [], 100.0
     
+    def _fping(self, targets: List[str], count: int) -> Optional[List[Tuple[List[float], float]]]:
+        """Ping every target from one fping process; None if fping can't"""
+        cmd = [self.fping, "-C", str(count), "-q", "-B1", "-r0", "-p", "200", *targets]
+        try:
+            code, _, err = self._run(cmd, count * 3 + 10)
+        except Exception:
+            return None
+        # 1 only means some target didn't answer; 2+ are usage/resolve errors
+        if code not in (0, 1):
+            return None
+        
+        replies = {
+            target: [float(t) for t in times.split() if t != b'-']
+            for target, times in _FPING_RE.findall(err)
+        }
+        runs = []
+        for target in targets:
+            times = replies.get(target.encode())
+            if times is None:
+                return None
+            runs.append((times, self._loss(times, count)))
+        return runs
+    
+    async def _ping_async(self, target: str, count: int) -> Tuple[List[float], float]:
+        """_ping_test as a coroutine, so several ping processes run at once"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self.netns_cmd, *self._ping_cmd(target, count),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                close_fds=False  # posix_spawn, as in _run
+            )
+            try:
+                out, _ = await asyncio.wait_for(proc.communicate(), count * 3 + 10)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                out = b""
+            times = list(map(float, _PING_RE.findall(out)))
+            return times, self._loss(times, count)
+        
+        except Exception:
+            return [], 100.0
+    
+    async def _ping_all(self, targets: List[str], count: int) -> List[Tuple[List[float], float]]:
+        # A long --ping-targets list shouldn't start that many processes at once
+        limit = asyncio.Semaphore(self.MAX_PING_PROCS)
+        
+        async def ping(target: str) -> Tuple[List[float], float]:
+            async with limit:
+                return await self._ping_async(target, count)
+        
+        return await asyncio.gather(*map(ping, targets))
+    
+    def _ping_targets(self, targets: List[str], count: int) -> Tuple[List[float], float]:
+        """Ping all targets concurrently; loss is averaged over targets"""
+        runs = None
+        # The raw socket lives in our namespace, not the worker's netns
+        if not _IS_WINDOWS and not self.netns_cmd:
+            runs = self._icmp_ping(targets, count)
+        
+        if runs is None and self.fping and not _IS_WINDOWS:
+            runs = self._fping(targets, count)
+        
+        if runs is None:
+            if len(targets) == 1:
+                runs = [self._ping_test(targets[0], count)]
+            else:
+                # One event loop waits on every ping process, no thread each
+                runs = asyncio.run(self._ping_all(targets, count))
+        
+        times = [t for run_times, _ in runs for t in run_times]
+        loss = sum(run_loss for _, run_loss in runs) / len(runs)
+        return times, loss
+    
     def test(
         self,
         config_path: str,
         params: AWGParams,
-        ping_target: str = "1.1.1.1",
-        ping_count: int = 5
+        ping_targets: Optional[List[str]] = None,
+        ping_count: int = 5,
+        name: Optional[str] = None
     ) -> TestResult:
         """Test a single configuration"""
+        ping_targets = ping_targets or ["1.1.1.1"]
+        name = name or Path(config_path).stem
         
         result = TestResult(
-            config_name=Path(config_path).stem,
-            params=params.to_dict(),
+            config_name=name,
+            params=params,
             timestamp=datetime.now().isoformat()
         )
         
-        success, error = self._up(config_path)
+        success, error = self._up(config_path, name)
         if not success:
             result.error = error
-            self._down(config_path)
+            self._live_base = None
+            self._down(name)
             return result
         
         result.success = True
         result.handshake_ok = self._check_handshake()
         
         if result.handshake_ok:
-            times, loss = self._ping_test(ping_target, ping_count)
+            times, loss = self._ping_targets(ping_targets, ping_count)
             result.packet_loss = loss
             if times:
-                result.ping_avg_ms = statistics.mean(times)
+                result.ping_avg_ms = sum(times) / len(times)
                 result.ping_min_ms = min(times)
                 result.ping_max_ms = max(times)
         
-        self._down(config_path)
-        time.sleep(2)
+        if not self.reuse_interface:
+            self._down(name)
+            time.sleep(2)
         
         return result
 
 
+# =============================================================================
+# PARALLEL WORKERS
+# =============================================================================
+
+# Per-process tester, bound to its own interface and namespace by _init_worker
+_worker_tester: Optional[ConfigTester] = None
+# This worker's slot, and the shared per-slot index of the variation each
+# worker is testing (-1 when idle), so the parent knows who was mid-test
+# when a worker died
+_worker_slot = -1
+_worker_in_flight = None
+
+
+def _worker_name(slot: int) -> str:
+    """Interface and network namespace name for a worker slot"""
+    return f"awg-test-{slot}"
+
+
+def _ip_batch(commands: List[str], ip: str = "ip"):
+    """Run ip commands (without the leading `ip`) through one ip process"""
+    # -force keeps going past a failed line (e.g. a namespace already there)
+    ip = _which(ip) or ip
+    subprocess.run(
+        [ip, "-force", "-batch", "-"],
+        input=''.join(f"{command}\n" for command in commands).encode(),
+        capture_output=True, close_fds=False
+    )
+
+
+def _add_netns(names: List[str], ip: str = "ip"):
+    """New namespaces, with loopback up (it starts down)"""
+    ip = _which(ip) or ip
+    _ip_batch([line for name in names for line in (
+        f"netns add {name}", f"netns exec {name} {ip} link set lo up"
+    )], ip)
+
+
+def _delete_netns(names: List[str], ip: str = "ip"):
+    _ip_batch([f"netns del {name}" for name in names], ip)
+
+
+def _enter_netns(name: str, ip: str = "ip") -> bool:
+    """Move this process into a named network namespace (Linux setns)"""
+    path = f"/run/netns/{name}"
+    if not os.path.exists(path):
+        _add_netns([name], ip)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        if hasattr(os, 'setns'):  # Python 3.12+
+            os.setns(fd, os.CLONE_NEWNET)
+            return True
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.setns(fd, 0x40000000) == 0  # CLONE_NEWNET
+    except (OSError, AttributeError):
+        return False
+    finally:
+        os.close(fd)
+
+
+def _init_worker(
+    slots,
+    in_flight,
+    detector: AWGDetector,
+    reuse_interface: bool = False,
+    cpu_pin: bool = False
+):
+    """Claim a free slot so each worker gets a unique interface and namespace"""
+    global _worker_tester, _worker_slot, _worker_in_flight
+    # Only the parent reports progress; a worker's stray output would
+    # interleave with it
+    sys.stdout = open(os.devnull, 'w')
+    slot = slots.get()
+    name = _worker_name(slot)
+    _worker_slot, _worker_in_flight = slot, in_flight
+    
+    # Keep each worker (and the commands it spawns) on one CPU
+    if cpu_pin and hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[slot % len(cpus)]})
+    
+    # Inside its namespace the worker runs commands (and opens its ICMP
+    # socket) directly, without an `ip netns exec` wrapper per command.
+    # Pool workers run tasks on the main thread, the one setns moved
+    if _enter_netns(name, detector.ip):
+        _worker_tester = ConfigTester(
+            detector, interface=name, reuse_interface=reuse_interface
+        )
+    else:
+        _worker_tester = ConfigTester(
+            detector, interface=name, netns=name, reuse_interface=reuse_interface
+        )
+
+
+def _worker_test(
+    config_path: str,
+    params: AWGParams,
+    ping_targets: List[str],
+    ping_count: int,
+    index: int = -1
+) -> TestResult:
+    _worker_in_flight[_worker_slot] = index
+    try:
+        return _worker_tester.test(config_path, params, ping_targets, ping_count)
+    finally:
+        _worker_in_flight[_worker_slot] = -1
+
+
 # =============================================================================
 # MAIN TESTER APPLICATION
 # =============================================================================
@@ -562,7 +1331,14 @@ class ConfigTester:
 class AWGTester:
     """Main application"""
     
-    def __init__(self, args):
+    CSV_HEADER = (
+        "Config", "Jc", "Jmin", "Jmax", "S1", "S2", "H1", "H2", "H3", "H4",
+        "Success", "Handshake", "Ping_Avg", "Ping_Min", "Ping_Max", "Loss", "Error"
+    )
+    # Jc..H4 out of an AWGParams in one C call, in CSV column order
+    CSV_PARAMS = operator.attrgetter(*CSV_HEADER[1:10])
+    
+    def __init__(self, args, detector: Optional[AWGDetector] = None):
         self.args = args
         self.config_dir = Path(args.config_dir)
         self.output_dir = Path(args.output_dir)
@@ -575,10 +1351,14 @@ class AWGTester:
         
         self.configs: List[WGConfig] = []
         self.variations: List[Tuple[str, AWGParams]] = []
+        # Base config name -> its variations, in generation order
+        self.config_variations: Dict[str, List[Tuple[str, AWGParams]]] = {}
         self.results: List[TestResult] = []
+        # Impatient sweep: config name -> last round it was tested in
+        self.rounds: Dict[str, int] = {}
         
-        # Detector
-        self.detector = AWGDetector()
+        # Detector, probed once by main() and shared with every tester
+        self.detector = detector or AWGDetector()
         
         # Parse parameter values
         self.jc_values = self._parse_values(args.jc_values, args.jc_range, [0, 3, 5, 10])
@@ -592,6 +1372,11 @@ class AWGTester:
         self.h2 = args.h2
         self.h3 = args.h3
         self.h4 = args.h4
+        
+        if args.ping_targets:
+            self.ping_targets = [t.strip() for t in args.ping_targets.split(',')]
+        else:
+            self.ping_targets = [args.ping_target]
     
     def _parse_values(
         self,
@@ -600,7 +1385,8 @@ class AWGTester:
         default: List[int]
     ) -> List[int]:
         if values_str:
-            return [int(x.strip()) for x in values_str.split(',')]
+            # Repeated values would generate and test the same variation twice
+            return list(dict.fromkeys(int(x.strip()) for x in values_str.split(',')))
         if range_args:
             start, end, step = range_args
             return list(range(start, end + 1, step))
@@ -621,7 +1407,9 @@ class AWGTester:
         print(f"LOADING CONFIGS FROM: {self.config_dir}")
         print(f"{'='*60}\n")
         
-        self.configs = ConfigParser.parse_directory(str(self.config_dir))
+        self.configs = ConfigParser.parse_directory(
+            str(self.config_dir), verbose=not self.args.quiet
+        )
         print(f"\nLoaded: {len(self.configs)} configurations")
         return len(self.configs)
     
@@ -638,30 +1426,42 @@ class AWGTester:
         print(f"\nFixed headers:")
         print(f"  H1={self.h1}, H2={self.h2}, H3={self.h3}, H4={self.h4}")
         
+        per_config = ConfigGenerator.grid_size(
+            self.jc_values, self.jmin_values, self.jmax_values,
+            self.s1_values, self.s2_values
+        )
+        print(f"\nExpected: {per_config} per config, "
+              f"{per_config * len(self.configs)} in total")
+        
         generator = ConfigGenerator(str(self.generated_dir))
         self.variations = []
+        self.config_variations = {}
         
-        for config in self.configs:
-            print(f"\n  Generating for: {config.name}")
-            
-            variations = generator.generate_variations(
-                config,
-                self.jc_values,
-                self.jmin_values,
-                self.jmax_values,
-                self.s1_values,
-                self.s2_values,
-                self.h1, self.h2, self.h3, self.h4
-            )
-            
-            self.variations.extend(variations)
-            print(f"    Created {len(variations)} variations")
+        try:
+            for config in self.configs:
+                print(f"\n  Generating for: {config.name}")
+                
+                variations = generator.generate_variations(
+                    config,
+                    self.jc_values,
+                    self.jmin_values,
+                    self.jmax_values,
+                    self.s1_values,
+                    self.s2_values,
+                    self.h1, self.h2, self.h3, self.h4
+                )
+                
+                self.variations.extend(variations)
+                self.config_variations[config.name] = variations
+                print(f"    Created {len(variations)} variations")
+        finally:
+            generator.close()
         
         print(f"\nTotal variations: {len(self.variations)}")
         return len(self.variations)
     
     def run_tests(self) -> int:
-        tester = ConfigTester(detector=self.detector)
+        tester = ConfigTester(self.detector, reuse_interface=self.args.reuse_interface)
         
         if not tester.is_admin:
             print("\n❌ Administrator/root privileges required!")
@@ -669,86 +1469,389 @@ class AWGTester:
             print("   Windows: Run as Administrator")
             return 0
         
+        adaptive = self.args.sweep_mode == 'bisect'
+        
+        workers = self.args.workers
+        if workers <= 0:
+            # Auto: a worker per CPU, but no more than there are variations
+            workers = os.cpu_count() or 1
+            if not adaptive:
+                workers = min(workers, len(self.variations))
+        workers = max(1, workers)
+        if workers > 1 and _IS_WINDOWS:
+            print("\n⚠️  --workers needs Linux network namespaces, running serially")
+            workers = 1
+        
         print(f"\n{'='*60}")
-        print(f"TESTING {len(self.variations)} CONFIGURATIONS")
+        if adaptive:
+            print("ADAPTIVE SWEEP (one parameter at a time)")
+        elif self.args.sweep_mode == 'impatient':
+            print(f"IMPATIENT SWEEP OF {len(self.variations)} CONFIGURATIONS")
+        else:
+            print(f"TESTING {len(self.variations)} CONFIGURATIONS")
         print(f"{'='*60}")
         print(f"\nUsing: {self.detector.awg_quick}")
         print(f"Is AmneziaWG: {self.detector.is_awg}")
+        print(f"Workers: {workers}")
         
-        for i, (config_path, params) in enumerate(self.variations, 1):
+        self._tester = tester
+        self._executor = self._start_workers(workers) if workers > 1 else None
+        self._stopped = False
+        try:
+            skip = self._preflight() if self.args.preflight else set()
+            if self._stopped:
+                pass
+            elif adaptive:
+                self._run_adaptive(skip)
+            elif self.args.sweep_mode == 'impatient':
+                self._run_impatient(self._skip_variations(skip))
+            else:
+                self._test_batch(self._skip_variations(skip))
+        finally:
+            if self._executor:
+                self._stop_workers(workers)
+            tester.close()
+        
+        return len(self.results)
+    
+    def _preflight(self) -> set:
+        """Test each base config as-is; returns the names of those that fail"""
+        print(f"\n  Preflight: testing the {len(self.configs)} base configs as-is")
+        results = self._test_batch([(c.filepath, c.params) for c in self.configs])
+        return {r.config_name for r in results if not r.handshake_ok}
+    
+    def _skip_variations(self, skip: set) -> List[Tuple[str, AWGParams]]:
+        """Variations left to test; those of failed base configs get a skipped result"""
+        if not skip:
+            return self.variations
+        
+        variations = []
+        for name, group in self.config_variations.items():
+            if name not in skip:
+                variations.extend(group)
+                continue
+            
+            print(f"\n  ⏭  Skipping {len(group)} variations of {name}: "
+                  f"the base config failed preflight")
+            for config_path, params in group:
+                self._record_result(TestResult(
+                    config_name=Path(config_path).stem,
+                    params=params,
+                    error="Skipped: base config failed preflight",
+                    timestamp=datetime.now().isoformat()
+                ))
+        return variations
+    
+    def _run_adaptive(self, skip: set):
+        values = {
+            'Jc': self.jc_values,
+            'Jmin': self.jmin_values,
+            'Jmax': self.jmax_values,
+            'S1': self.s1_values,
+            'S2': self.s2_values,
+        }
+        
+        with ConfigGenerator(str(self.generated_dir)) as generator:
+            for config in self.configs:
+                if config.name in skip:
+                    print(f"\n  ⏭  Skipping {config.name}: the base config failed preflight")
+                    continue
+                print(f"\n  Adaptive sweep for: {config.name}")
+                start = config.params.copy(H1=self.h1, H2=self.h2, H3=self.h3, H4=self.h4)
+                scheduler = AdaptiveSweepScheduler(generator, config, values, start)
+                scheduler.run(self._test_batch)
+                if self._stopped:
+                    break
+    
+    def _run_impatient(self, variations: List[Tuple[str, AWGParams]]):
+        """Screen with a few pings, re-test the better half with more, and so on"""
+        count = self.args.ping_count
+        # Capped runs as in ParamILS: cheap screens first, the full count last
+        caps = [cap for cap in (3, 10) if cap < count] + [count]
+        by_name = {Path(config_path).stem: (config_path, params)
+                   for config_path, params in variations}
+        
+        for round_no, cap in enumerate(caps, 1):
+            print(f"\n  Round {round_no}/{len(caps)}: {len(variations)} variations, "
+                  f"{cap} pings each")
+            results = self._test_batch(variations, cap)
+            for r in results:
+                self.rounds[r.config_name] = round_no
+            if self._stopped or round_no == len(caps):
+                break
+            
+            # Keep the better half of those that answered at all
+            ranked = sorted((r for r in results if r.ping_avg_ms > 0), key=_rank_key)
+            ranked = ranked[:max(1, len(results) // 2)]
+            if not ranked:
+                print("\n  No variation answered pings, stopping")
+                break
+            variations = [by_name[r.config_name] for r in ranked]
+    
+    def _start_workers(self, workers: int) -> ProcessPoolExecutor:
+        """Worker pool, one network namespace per worker"""
+        # Missing namespaces in one go; workers then find theirs already
+        # there. Existing ones (e.g. set up with an uplink) are used as is
+        names = [_worker_name(slot) for slot in range(workers)]
+        self._created_netns = [name for name in names
+                               if not os.path.exists(f"/run/netns/{name}")]
+        if self._created_netns:
+            _add_netns(self._created_netns, self.detector.ip)
+            print(f"\n⚠️  Created namespaces {', '.join(self._created_netns)} with only "
+                  f"loopback; without a route to the endpoints (e.g. veth + NAT) "
+                  f"tunnels in them get no handshake")
+        return self._new_pool(workers)
+    
+    def _new_pool(self, workers: int) -> ProcessPoolExecutor:
+        slots = multiprocessing.Queue()
+        for slot in range(workers):
+            slots.put(slot)
+        self._workers = workers
+        self._in_flight = multiprocessing.RawArray('i', [-1] * workers)
+        
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(slots, self._in_flight, self.detector,
+                      self.args.reuse_interface, self.args.cpu_pin)
+        )
+    
+    def _restart_pool(self):
+        """Replace a broken pool; the namespaces stay"""
+        self._executor.shutdown(cancel_futures=True)
+        self._executor = self._new_pool(self._workers)
+    
+    def _stop_workers(self, workers: int):
+        self._executor.shutdown(cancel_futures=True)
+        self._executor = None
+        names = [_worker_name(slot) for slot in range(workers)]
+        if self.args.reuse_interface:
+            # Tunnels left up by the workers, and their config copies
+            for name in names:
+                ConfigTester(self.detector, interface=name, netns=name)._down()
+        # Only what this run created; namespaces the user set up stay
+        if self._created_netns:
+            _delete_netns(self._created_netns, self.detector.ip)
+            self._created_netns = []
+    
+    def _test_batch(
+        self,
+        variations: List[Tuple[str, AWGParams]],
+        ping_count: Optional[int] = None
+    ) -> List[TestResult]:
+        """Test variations on the worker pool if there is one, else in order"""
+        ping_count = ping_count or self.args.ping_count
+        if self._executor:
+            return self._test_parallel(variations, ping_count)
+        return self._test_serial(variations, ping_count)
+    
+    def _test_serial(
+        self,
+        variations: List[Tuple[str, AWGParams]],
+        ping_count: int
+    ) -> List[TestResult]:
+        results = []
+        for i, (config_path, params) in enumerate(variations, 1):
             name = Path(config_path).stem
-            print(f"\n[{i}/{len(self.variations)}] {name}")
-            print(f"  Jc={params.Jc}, Jmin={params.Jmin}, Jmax={params.Jmax}, "
-                  f"S1={params.S1}, S2={params.S2}")
+            self._print_test_header(i, len(variations), name, params)
             
-            result = tester.test(
+            result = self._tester.test(
                 config_path, params,
-                self.args.ping_target,
-                self.args.ping_count
+                self.ping_targets,
+                ping_count,
+                name=name
             )
-            self.results.append(result)
+            self._record_result(result)
+            results.append(result)
             
-            if result.handshake_ok:
-                print(f"  ✓ Handshake OK | Ping: {result.ping_avg_ms:.1f}ms | "
-                      f"Loss: {result.packet_loss:.0f}%")
-            elif result.success:
-                print(f"  ⚠ Connected but no handshake")
-            else:
-                # Truncate long errors
-                error_short = result.error[:100] + "..." if len(result.error) > 100 else result.error
-                print(f"  ✗ Failed: {error_short}")
-                
-                # Check for the specific AWG error
-                if "Line unrecognized" in result.error or "Jc" in result.error:
-                    print(f"  ⚠ This error means standard WireGuard is being used!")
-                    print(f"  ⚠ Please install AmneziaWG (awg-quick, awg)")
-                    if not self.args.force:
-                        print(f"\n  Stopping tests. Use --force to continue anyway.")
+            if not self._print_test_outcome(result):
+                self._stopped = True
+                break
+        
+        return results
+    
+    def _test_parallel(
+        self,
+        variations: List[Tuple[str, AWGParams]],
+        ping_count: int
+    ) -> List[TestResult]:
+        results: List[TestResult] = []
+        untested = dict(enumerate(variations))
+        
+        while untested and not self._stopped:
+            try:
+                self._run_parallel(untested, ping_count, results, len(variations))
+            except BrokenProcessPool:
+                # A worker died (crash, OOM kill). Those mid-test when the
+                # pool broke are retried one at a time on a fresh pool, so
+                # only the variation that kills a worker again is failed
+                suspects = [i for i in self._in_flight if i in untested]
+                if not suspects:
+                    # Died outside a test (e.g. at startup): drop the pool
+                    # and test this and later batches serially
+                    print("\n⚠️  Worker pool failed outside a test, continuing serially")
+                    self._stop_workers(self._workers)
+                    results += self._test_serial(list(untested.values()), ping_count)
+                    break
+                self._restart_pool()
+                for index in suspects:
+                    if self._stopped:
                         break
+                    try:
+                        self._run_parallel({index: untested.pop(index)}, ping_count,
+                                           results, len(variations))
+                    except BrokenProcessPool:
+                        self._restart_pool()
+                        config_path, params = variations[index]
+                        self._finish_parallel(TestResult(
+                            config_name=Path(config_path).stem,
+                            params=params,
+                            error="Worker error: the worker process died during this test",
+                            timestamp=datetime.now().isoformat()
+                        ), params, results, len(variations))
         
-        return len(self.results)
+        return results
+    
+    def _run_parallel(
+        self,
+        untested: Dict[int, Tuple[str, AWGParams]],
+        ping_count: int,
+        results: List[TestResult],
+        total: int
+    ):
+        """Test on the pool, removing each variation from untested once recorded;
+        raises BrokenProcessPool if a worker dies"""
+        futures = {
+            self._executor.submit(
+                _worker_test, config_path, params,
+                self.ping_targets, ping_count, index
+            ): index
+            for index, (config_path, params) in untested.items()
+        }
+        
+        for future in as_completed(futures):
+            index = futures[future]
+            config_path, params = untested[index]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                # The test itself raised: that variation fails, not the sweep
+                result = TestResult(
+                    config_name=Path(config_path).stem,
+                    params=params,
+                    error=f"Worker error: {e}",
+                    timestamp=datetime.now().isoformat()
+                )
+            del untested[index]
+            if not self._finish_parallel(result, params, results, total):
+                for pending in futures:
+                    pending.cancel()
+                return
+    
+    def _finish_parallel(
+        self,
+        result: TestResult,
+        params: AWGParams,
+        results: List[TestResult],
+        total: int
+    ) -> bool:
+        self._record_result(result)
+        results.append(result)
+        
+        self._print_test_header(len(results), total, result.config_name, params)
+        if not self._print_test_outcome(result):
+            self._stopped = True
+            return False
+        return True
+    
+    def _print_test_header(self, index: int, total: int, name: str, params: AWGParams):
+        print(f"\n[{index}/{total}] {name}\n"
+              f"  Jc={params.Jc}, Jmin={params.Jmin}, Jmax={params.Jmax}, "
+              f"S1={params.S1}, S2={params.S2}")
+    
+    def _print_test_outcome(self, result: TestResult) -> bool:
+        """Print a test outcome; returns False if the sweep should stop"""
+        # Collected and printed at once: one write per test, not per line
+        lines = []
+        proceed = True
+        if result.handshake_ok:
+            lines.append(f"  ✓ Handshake OK | Ping: {result.ping_avg_ms:.1f}ms | "
+                         f"Loss: {result.packet_loss:.0f}%")
+        elif result.success:
+            lines.append(f"  ⚠ Connected but no handshake")
+        else:
+            # Truncate long errors
+            error_short = result.error[:100] + "..." if len(result.error) > 100 else result.error
+            lines.append(f"  ✗ Failed: {error_short}")
+            
+            # Check for the specific AWG error
+            if "Line unrecognized" in result.error or "Jc" in result.error:
+                lines.append(f"  ⚠ This error means standard WireGuard is being used!")
+                lines.append(f"  ⚠ Please install AmneziaWG (awg-quick, awg)")
+                if not self.args.force:
+                    lines.append(f"\n  Stopping tests. Use --force to continue anyway.")
+                    proceed = False
+        
+        print("\n".join(lines))
+        return proceed
+    
+    def _open_result_streams(self):
+        """Open the results files; each test is appended as soon as it finishes"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.json_path = self.results_dir / f"results_{timestamp}.ndjson"
+        self.csv_path = self.results_dir / f"results_{timestamp}.csv"
+        
+        self._json_stream = open(self.json_path, 'wb')
+        self._csv_stream = open(self.csv_path, 'w', newline='')
+        self._csv_writer = csv.writer(self._csv_stream)
+        self._csv_writer.writerow(self.CSV_HEADER)
+    
+    def _record_result(self, result: TestResult):
+        self.results.append(result)
+        
+        # JSON lines, so nothing has to be rewritten as the sweep grows
+        record = result.to_dict()
+        if orjson:
+            self._json_stream.write(orjson.dumps(record) + b"\n")
+        else:
+            # Compact like orjson; the default ", " / ": " only pads the file
+            self._json_stream.write(json.dumps(record, separators=(',', ':')).encode() + b"\n")
+        
+        self._csv_writer.writerow((
+            result.config_name,
+            *self.CSV_PARAMS(result.params),
+            result.success, result.handshake_ok,
+            round(result.ping_avg_ms, 1), round(result.ping_min_ms, 1),
+            round(result.ping_max_ms, 1), round(result.packet_loss, 1),
+            result.error[:50]
+        ))
+        
+        # One write per file per test; an interrupted sweep keeps what it had
+        self._json_stream.flush()
+        self._csv_stream.flush()
+    
+    def _close_result_streams(self):
+        for stream in (self._json_stream, self._csv_stream):
+            stream.flush()
+            os.fsync(stream.fileno())
+            stream.close()
     
     def save_results(self):
+        self._close_result_streams()
+        
         if not self.results:
+            os.remove(self.json_path)
+            os.remove(self.csv_path)
             print("\nNo results to save")
             return
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # JSON
-        json_path = self.results_dir / f"results_{timestamp}.json"
-        with open(json_path, 'w') as f:
-            json.dump([{
-                'name': r.config_name,
-                'params': r.params,
-                'success': r.success,
-                'handshake': r.handshake_ok,
-                'ping_avg': r.ping_avg_ms,
-                'ping_min': r.ping_min_ms,
-                'ping_max': r.ping_max_ms,
-                'loss': r.packet_loss,
-                'error': r.error
-            } for r in self.results], f, indent=2)
-        
-        # CSV
-        csv_path = self.results_dir / f"results_{timestamp}.csv"
-        with open(csv_path, 'w') as f:
-            f.write("Config,Jc,Jmin,Jmax,S1,S2,H1,H2,H3,H4,"
-                   "Success,Handshake,Ping_Avg,Ping_Min,Ping_Max,Loss,Error\n")
-            for r in self.results:
-                p = r.params
-                error_clean = r.error.replace(',', ';').replace('\n', ' ')[:50]
-                f.write(f"{r.config_name},{p['Jc']},{p['Jmin']},{p['Jmax']},"
-                       f"{p['S1']},{p['S2']},{p['H1']},{p['H2']},{p['H3']},{p['H4']},"
-                       f"{r.success},{r.handshake_ok},{r.ping_avg_ms:.1f},"
-                       f"{r.ping_min_ms:.1f},{r.ping_max_ms:.1f},{r.packet_loss:.1f},"
-                       f"\"{error_clean}\"\n")
-        
         print(f"\n{'='*60}")
         print("RESULTS SAVED")
         print(f"{'='*60}")
-        print(f"  JSON: {json_path}")
-        print(f"  CSV:  {csv_path}")
+        print(f"  JSON: {self.json_path}")
+        print(f"  CSV:  {self.csv_path}")
         
         self._print_summary()
     
@@ -757,10 +1860,13 @@ class AWGTester:
         print("SUMMARY")
         print(f"{'='*70}")
         
-        successful = [r for r in self.results if r.handshake_ok]
-        failed = [r for r in self.results if not r.handshake_ok]
+        # A variation re-tested by the impatient sweep counts once, by its
+        # last (longest) run
+        results = list({r.config_name: r for r in self.results}.values())
+        successful = [r for r in results if r.handshake_ok]
+        failed = [r for r in results if not r.handshake_ok]
         
-        print(f"\nTotal: {len(self.results)} | Success: {len(successful)} | Failed: {len(failed)}")
+        print(f"\nTotal: {len(results)} | Success: {len(successful)} | Failed: {len(failed)}")
         
         # Check for AWG-specific errors
         awg_errors = [r for r in failed if "Line unrecognized" in r.error or "Jc" in r.error]
@@ -769,25 +1875,31 @@ class AWGTester:
             print(f"   Standard WireGuard cannot parse AWG parameters.")
         
         if successful:
-            successful.sort(key=lambda x: x.ping_avg_ms if x.ping_avg_ms > 0 else 9999)
+            # Only the top 20 are shown, no need to sort the whole list.
+            # Impatient sweeps rank later (longer) rounds first, so a short
+            # lucky screen never beats the full-count runs
+            top = heapq.nsmallest(
+                20, successful,
+                key=lambda r: (-self.rounds.get(r.config_name, 0), _rank_key(r))
+            )
             
             print(f"\n{'─'*70}")
             print(f"{'Jc':<4} {'Jmin':<5} {'Jmax':<5} {'S1':<4} {'S2':<4} "
                   f"{'Ping Avg':<10} {'Loss%':<8} Config")
             print(f"{'─'*70}")
             
-            for r in successful[:20]:
+            for r in top:
                 p = r.params
-                print(f"{p['Jc']:<4} {p['Jmin']:<5} {p['Jmax']:<5} "
-                      f"{p['S1']:<4} {p['S2']:<4} "
+                print(f"{p.Jc:<4} {p.Jmin:<5} {p.Jmax:<5} "
+                      f"{p.S1:<4} {p.S2:<4} "
                       f"{r.ping_avg_ms:<10.1f} {r.packet_loss:<8.1f} {r.config_name[:30]}")
             
-            best = successful[0]
+            best = top[0]
             p = best.params
             print(f"\n{'─'*70}")
-            print(f"🏆 BEST: Jc={p['Jc']}, Jmin={p['Jmin']}, Jmax={p['Jmax']}, "
-                  f"S1={p['S1']}, S2={p['S2']}")
-            print(f"   H1={p['H1']}, H2={p['H2']}, H3={p['H3']}, H4={p['H4']}")
+            print(f"🏆 BEST: Jc={p.Jc}, Jmin={p.Jmin}, Jmax={p.Jmax}, "
+                  f"S1={p.S1}, S2={p.S2}")
+            print(f"   H1={p.H1}, H2={p.H2}, H3={p.H3}, H4={p.H4}")
             print(f"   Ping: {best.ping_avg_ms:.1f}ms, Loss: {best.packet_loss:.0f}%")
             
             self._generate_recommended(best)
@@ -796,19 +1908,19 @@ class AWGTester:
         if not self.configs:
             return
         
-        params = AWGParams(**best.params)
-        generator = ConfigGenerator(str(self.output_dir))
+        params = best.params
         
         print(f"\n{'─'*70}")
         print("RECOMMENDED CONFIGURATIONS:")
         
-        for config in self.configs:
-            filepath = generator.generate(config, params, "RECOMMENDED")
-            print(f"\n  📄 {filepath}")
-            
-            with open(filepath, 'r') as f:
+        with ConfigGenerator(str(self.output_dir)) as generator:
+            for config in self.configs:
+                filepath = generator.generate(config, params, "RECOMMENDED")
+                print(f"\n  📄 {filepath}")
+                
+                # Shown from the parsed config rather than read back from disk
                 print(f"\n  {'─'*40}")
-                for line in f:
+                for line in generator.render(config, params).splitlines():
                     print(f"  {line.rstrip()}")
                 print(f"  {'─'*40}")
     
@@ -821,7 +1933,9 @@ class AWGTester:
             print(f"\n❌ No .conf files found in {self.config_dir}")
             sys.exit(1)
         
-        if self.generate_variations() == 0:
+        # The adaptive sweep generates its variations as it goes
+        adaptive = self.args.sweep_mode == 'bisect' and not self.args.generate_only
+        if not adaptive and self.generate_variations() == 0:
             print("\n❌ No variations generated")
             sys.exit(1)
         
@@ -829,14 +1943,27 @@ class AWGTester:
             print(f"\n✓ Generated {len(self.variations)} configs in {self.generated_dir}")
             return
         
-        self.run_tests()
-        self.save_results()
+        self._open_result_streams()
+        try:
+            self.run_tests()
+        finally:
+            self.save_results()
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
+BANNER = """
+╔══════════════════════════════════════════════════════════════════╗
+║          AmneziaWG Configuration Tester                          ║
+║   Requires: awg-quick, awg (AmneziaWG tools)                     ║
+║   NOT compatible with standard wg-quick/wg                       ║
+╚══════════════════════════════════════════════════════════════════╝
+    
+""".encode()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="AmneziaWG Configuration Tester (requires AmneziaWG, not standard WireGuard)",
@@ -859,6 +1986,15 @@ Examples:
   # Specific Jc values
   sudo python3 awg_tester.py -c ./conf --jc-values 1,3,5,10,15
   
+  # Tune one parameter at a time instead of testing every combination
+  sudo python3 awg_tester.py -c ./conf --sweep-mode bisect
+  
+  # Screen every combination briefly, spend the full ping count on the best
+  sudo python3 awg_tester.py -c ./conf --sweep-mode impatient --ping-count 20
+  
+  # Test 4 configs at a time, each in its own network namespace
+  sudo python3 awg_tester.py -c ./conf --workers 4
+  
   # Generate configs only
   python3 awg_tester.py -c ./conf --generate-only
         """
@@ -890,26 +2026,41 @@ Examples:
     
     # Test options
     parser.add_argument('--ping-target', default='1.1.1.1', help='Ping target')
+    parser.add_argument('--ping-targets',
+                       help='Ping targets (comma-separated), pinged in parallel; '
+                            'overrides --ping-target')
     parser.add_argument('--ping-count', type=int, default=5, help='Ping count')
+    parser.add_argument('--sweep-mode', choices=['grid', 'bisect', 'impatient'], default='grid',
+                       help='grid: test every combination; bisect: tune one parameter '
+                            'at a time around the best result so far; impatient: screen '
+                            'every combination with 3 then 10 pings, keeping the better '
+                            'half each round')
+    parser.add_argument('--workers', '--jobs', type=int, default=1,
+                       help='Parallel test workers, each in its own network namespace '
+                            '(Linux); 0 = one per CPU')
+    parser.add_argument('--cpu-pin', action='store_true',
+                       help='Pin each parallel worker to its own CPU (Linux)')
+    parser.add_argument('--preflight', action='store_true',
+                       help='Test each base config first and skip the variations of '
+                            'those that get no handshake')
+    parser.add_argument('--reuse-interface', action='store_true',
+                       help='Keep the tunnel up between variations of the same config and '
+                            'swap the AWG params with awg setconf (Linux)')
     parser.add_argument('--generate-only', action='store_true', help='Only generate configs')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Do not list every loaded config')
     parser.add_argument('--force', action='store_true', 
                        help='Force testing even without AmneziaWG (will likely fail)')
     
     args = parser.parse_args()
     
-    print("""
-╔══════════════════════════════════════════════════════════════════╗
-║          AmneziaWG Configuration Tester                          ║
-║   Requires: awg-quick, awg (AmneziaWG tools)                     ║
-║   NOT compatible with standard wg-quick/wg                       ║
-╚══════════════════════════════════════════════════════════════════╝
-    """)
-    
-    print(f"Platform: {platform.system()}")
-    print(f"Config dir: {args.config_dir}")
-    print(f"H values: H1={args.h1}, H2={args.h2}, H3={args.h3}, H4={args.h4}")
+    sys.stdout.buffer.write(BANNER)
+    print(f"Platform: {_SYSTEM}\n"
+          f"Config dir: {args.config_dir}\n"
+          f"H values: H1={args.h1}, H2={args.h2}, H3={args.h3}, H4={args.h4}")
     
-    app = AWGTester(args)
+    detector = AWGDetector()
+    app = AWGTester(args, detector)
     app.run()
     
     print(f"\n{'='*60}")